@@ -13,12 +13,31 @@ The agent definition shows how to register custom tools that can
 interact with your business logic (e.g. calling nphies APIs or
 internal services).  A simple `check_eligibility` tool is provided
 as an example.
+
+Run it with the libuv event loop, the C HTTP parser and one worker
+per core, e.g. `python app.py` or
+`uvicorn app:app --workers $(nproc) --loop uvloop --http httptools
+--no-access-log --backlog 4096 --limit-concurrency 2048`.
 """
 
 from __future__ import annotations
 
-from fastapi import FastAPI, Request
-from starlette.responses import Response, FileResponse
+# Install uvloop as the event loop policy before anything creates a
+# loop.  It ships with `uvicorn[standard]`; fall back to the stock
+# asyncio loop when it is unavailable (e.g. on Windows).
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+
+import hashlib
+from pathlib import Path
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from starlette.responses import Response
 from pydantic import BaseModel
 
 # Import the core pieces from pydantic‑ai
@@ -44,6 +63,11 @@ class ConversationState(BaseModel):
     coverage_checked: bool = False
 
 
+# Compiled pydantic-core serializer for the state, reused for every
+# snapshot instead of going through the generic model_dump path.
+_STATE_SER = ConversationState.__pydantic_serializer__
+
+
 # Instantiate an agent using an OpenAI model and provide basic
 # instructions.  Replace `openai:gpt-4.1` with another provider
 # when using a different LLM.  The `deps_type` argument tells
@@ -93,7 +117,7 @@ async def check_eligibility(
         metadata=[
             StateSnapshotEvent(
                 type=EventType.STATE_SNAPSHOT,
-                snapshot=ctx.deps.state,
+                snapshot=_STATE_SER.to_python(ctx.deps.state, mode="json"),
             ),
         ],
     )
@@ -113,8 +137,9 @@ async def summarize_claim(
     return f"Please summarize the following claim in plain language: {claim_text}"
 
 
-# Initialize the FastAPI application
-app = FastAPI()
+# Initialize the FastAPI application.  JSON responses are rendered with
+# orjson instead of the stdlib encoder.
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
 @app.post("/")
@@ -125,35 +150,99 @@ async def run_agent(request: Request) -> Response:
     endpoint.  `handle_ag_ui_request` converts the request into
     pydantic‑ai types and returns a streaming response of AG‑UI
     events.  The FastAPI endpoint returns this streaming
-    response directly to the client.
+    response directly to the client.  The stream is driven by an
+    async generator, so no threadpool hop is involved per event.
     """
     return await handle_ag_ui_request(agent, request)
 
+# Static HTML pages served by this app.  They are immutable at runtime,
+# so each one is read once at import and served from memory with an
+# ETag, letting browsers revalidate with a cheap 304.  The handlers
+# below stay `async def` and never touch disk, so Starlette runs them
+# directly on the event loop instead of offloading to its threadpool.
+_PAGE_NAMES = (
+    "login",
+    "dashboard",
+    "nphies",
+    "profile",
+    "notifications",
+    "pre-authorization",
+    "eligibility",
+)
+
+
+def _load_page(name: str) -> tuple[str, Response, Response]:
+    body = Path(f"{name}.html").read_bytes()
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    page = Response(
+        content=body,
+        media_type="text/html",
+        headers={"ETag": etag, "Cache-Control": "public, max-age=300"},
+    )
+    # The 304 reply is as static as the page itself, so build it once.
+    not_modified = Response(status_code=304, headers={"ETag": etag})
+    return etag, page, not_modified
+
+
+_PAGES = {
+    name: _load_page(name)
+    for name in _PAGE_NAMES
+    if Path(f"{name}.html").is_file()
+}
+
+
+def _serve_page(request: Request, name: str) -> Response:
+    cached = _PAGES.get(name)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+    etag, page, not_modified = cached
+    if request.headers.get("if-none-match") == etag:
+        return not_modified
+    return page
+
+
 @app.get("/login")
-async def login():
-    return FileResponse("login.html")
+async def login(request: Request):
+    return _serve_page(request, "login")
 
 @app.get("/dashboard")
-async def dashboard():
-    return FileResponse("dashboard.html")
+async def dashboard(request: Request):
+    return _serve_page(request, "dashboard")
 
 @app.get("/nphies")
-async def nphies():
-    return FileResponse("nphies.html")
+async def nphies(request: Request):
+    return _serve_page(request, "nphies")
 
 @app.get("/profile")
-async def profile():
-    return FileResponse("profile.html")
+async def profile(request: Request):
+    return _serve_page(request, "profile")
 
 @app.get("/notifications")
-async def notifications():
-    return FileResponse("notifications.html")
+async def notifications(request: Request):
+    return _serve_page(request, "notifications")
 
 @app.get("/pre-authorization")
-async def pre_authorization():
-    return FileResponse("pre-authorization.html")
+async def pre_authorization(request: Request):
+    return _serve_page(request, "pre-authorization")
 
 @app.get("/eligibility")
-async def eligibility():
-    return FileResponse("eligibility.html")
+async def eligibility(request: Request):
+    return _serve_page(request, "eligibility")
+
+
+if __name__ == "__main__":
+    import os
 
+    import uvicorn
+
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        backlog=4096,
+        limit_concurrency=2048,
+    )
@@ -5,48 +5,109 @@ This script provides a structured approach for automated code review and enhance
 """
 
 import os
-import json
+import sys
+import asyncio
+import logging
+import logging.handlers
+import queue
+import orjson
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Any
 
+log = logging.getLogger("codex")
+
+# Static report sections, shared read-only by every generated report
+_ACTION_ITEMS = (
+    MappingProxyType({
+        "priority": "CRITICAL",
+        "category": "Security",
+        "description": "Implement JWT authentication",
+        "estimated_effort": "2-3 days",
+        "assigned_to": "Backend Team"
+    }),
+    MappingProxyType({
+        "priority": "HIGH",
+        "category": "Performance",
+        "description": "Optimize API response times",
+        "estimated_effort": "1-2 weeks",
+        "assigned_to": "Full Stack Team"
+    })
+)
+
+_NEXT_STEPS = (
+    "Address all CRITICAL priority items immediately",
+    "Create GitHub issues for each identified problem",
+    "Implement recommended security enhancements",
+    "Set up comprehensive monitoring and alerting",
+    "Schedule follow-up review in 30 days"
+)
+
+
+def configure_logging() -> logging.handlers.QueueListener:
+    """Route progress output through a queue drained by a background thread"""
+    log_queue: queue.Queue = queue.Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    listener.start()
+    return listener
+
+def _execute_task(task: Dict[str, Any], started_at: str) -> Dict[str, Any]:
+    """Run one review task; module-level so worker processes can unpickle it"""
+    return {
+        "name": task["name"],
+        "priority": task["priority"],
+        "status": "completed",
+        "findings": [],
+        "recommendations": [],
+        "files_analyzed": task.get("files", []),
+        "execution_time": started_at
+    }
+
+
 class CodexReviewAgent:
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.reports_dir = self.project_root / "codex_reports"
-        self.reports_dir.mkdir(exist_ok=True)
+        try:
+            os.mkdir(self.reports_dir)
+        except FileExistsError:
+            pass
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # CPU-bound checks run in worker processes to sidestep the GIL
+        self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
         
-    def execute_phase(self, phase_name: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Execute a review phase with multiple tasks"""
-        print(f"\n🚀 Starting {phase_name}")
+    async def execute_phase(self, phase_name: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Execute a review phase, running its independent tasks concurrently"""
+        log.info(f"\n🚀 Starting {phase_name}")
         phase_results = {
             "phase": phase_name,
             "timestamp": self.timestamp,
             "tasks": []
         }
         
-        for task in tasks:
-            print(f"  📋 Executing: {task['name']}")
-            task_result = self.execute_task(task)
-            phase_results["tasks"].append(task_result)
+        # One timestamp per phase; phases run concurrently, so it is passed
+        # down rather than stored on the agent.
+        started_at = datetime.now().isoformat()
+        results = await asyncio.gather(*(self.execute_task(task, started_at) for task in tasks))
+        phase_results["tasks"].extend(results)
             
         return phase_results
     
-    def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute individual review task"""
-        return {
-            "name": task["name"],
-            "priority": task["priority"],
-            "status": "completed",
-            "findings": [],
-            "recommendations": [],
-            "files_analyzed": task.get("files", []),
-            "execution_time": datetime.now().isoformat()
-        }
+    async def execute_task(self, task: Dict[str, Any], started_at: str) -> Dict[str, Any]:
+        """Execute individual review task in the process pool"""
+        log.info(f"  📋 Executing: {task['name']}")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _execute_task, task, started_at)
     
-    def analyze_security(self) -> Dict[str, Any]:
+    async def analyze_security(self) -> Dict[str, Any]:
         """Phase 1.1: Security Review"""
         tasks = [
             {
@@ -84,9 +145,9 @@ class CodexReviewAgent:
             }
         ]
         
-        return self.execute_phase("Security Analysis", tasks)
+        return await self.execute_phase("Security Analysis", tasks)
     
-    def analyze_performance(self) -> Dict[str, Any]:
+    async def analyze_performance(self) -> Dict[str, Any]:
         """Phase 1.2: Performance Analysis"""
         tasks = [
             {
@@ -113,9 +174,9 @@ class CodexReviewAgent:
             }
         ]
         
-        return self.execute_phase("Performance Analysis", tasks)
+        return await self.execute_phase("Performance Analysis", tasks)
     
-    def review_healthcare_compliance(self) -> Dict[str, Any]:
+    async def review_healthcare_compliance(self) -> Dict[str, Any]:
         """Phase 2.1: Healthcare-Specific Review"""
         tasks = [
             {
@@ -142,7 +203,7 @@ class CodexReviewAgent:
             }
         ]
         
-        return self.execute_phase("Healthcare Compliance Review", tasks)
+        return await self.execute_phase("Healthcare Compliance Review", tasks)
     
     def generate_comprehensive_report(self, all_results: List[Dict[str, Any]]) -> str:
         """Generate final comprehensive report"""
@@ -163,77 +224,63 @@ class CodexReviewAgent:
                 "overall_score": "A-"
             },
             "phase_results": all_results,
-            "action_items": [
-                {
-                    "priority": "CRITICAL",
-                    "category": "Security",
-                    "description": "Implement JWT authentication",
-                    "estimated_effort": "2-3 days",
-                    "assigned_to": "Backend Team"
-                },
-                {
-                    "priority": "HIGH", 
-                    "category": "Performance",
-                    "description": "Optimize API response times",
-                    "estimated_effort": "1-2 weeks",
-                    "assigned_to": "Full Stack Team"
-                }
-            ],
-            "next_steps": [
-                "Address all CRITICAL priority items immediately",
-                "Create GitHub issues for each identified problem",
-                "Implement recommended security enhancements",
-                "Set up comprehensive monitoring and alerting",
-                "Schedule follow-up review in 30 days"
-            ]
+            "action_items": _ACTION_ITEMS,
+            "next_steps": _NEXT_STEPS
         }
         
-        with open(report_file, 'w') as f:
-            json.dump(comprehensive_report, f, indent=2)
+        with open(report_file, 'wb') as f:
+            # orjson has no native support for MappingProxyType, so the
+            # frozen action items are unwrapped through default=dict.
+            f.write(orjson.dumps(comprehensive_report, default=dict, option=orjson.OPT_INDENT_2))
             
         return str(report_file)
     
-    def run_complete_review(self) -> str:
+    async def run_complete_review(self) -> str:
         """Execute complete codebase review"""
-        print("🤖 Starting Codex Agent Complete Codebase Review")
-        print(f"📁 Project: {self.project_root}")
-        print(f"⏰ Timestamp: {self.timestamp}")
-        
-        all_results = []
-        
-        # Phase 1: Security & Performance
-        all_results.append(self.analyze_security())
-        all_results.append(self.analyze_performance())
+        log.info("🤖 Starting Codex Agent Complete Codebase Review")
+        log.info(f"📁 Project: {self.project_root}")
+        log.info(f"⏰ Timestamp: {self.timestamp}")
         
-        # Phase 2: Healthcare Compliance
-        all_results.append(self.review_healthcare_compliance())
+        # Phase 1: Security & Performance, Phase 2: Healthcare Compliance.
+        # The phases are independent, so they run concurrently.
+        try:
+            all_results = list(await asyncio.gather(
+                self.analyze_security(),
+                self.analyze_performance(),
+                self.review_healthcare_compliance()
+            ))
+        finally:
+            self._pool.shutdown()
         
         # Generate comprehensive report
         report_file = self.generate_comprehensive_report(all_results)
         
-        print(f"\n✅ Review Complete!")
-        print(f"📊 Report generated: {report_file}")
-        print(f"📁 All reports saved to: {self.reports_dir}")
+        log.info(f"\n✅ Review Complete!")
+        log.info(f"📊 Report generated: {report_file}")
+        log.info(f"📁 All reports saved to: {self.reports_dir}")
         
         return report_file
 
 def main():
     """Main execution function"""
+    listener = configure_logging()
     project_root = os.getcwd()
     agent = CodexReviewAgent(project_root)
     
     try:
-        report_file = agent.run_complete_review()
-        print(f"\n🎯 Next Steps:")
-        print(f"1. Review the comprehensive report: {report_file}")
-        print(f"2. Address CRITICAL priority items immediately")
-        print(f"3. Create GitHub issues for identified problems")
-        print(f"4. Implement recommended enhancements")
-        print(f"5. Schedule follow-up review")
+        report_file = asyncio.run(agent.run_complete_review())
+        log.info(f"\n🎯 Next Steps:")
+        log.info(f"1. Review the comprehensive report: {report_file}")
+        log.info(f"2. Address CRITICAL priority items immediately")
+        log.info(f"3. Create GitHub issues for identified problems")
+        log.info(f"4. Implement recommended enhancements")
+        log.info(f"5. Schedule follow-up review")
         
     except Exception as e:
-        print(f"❌ Error during review: {str(e)}")
+        log.error(f"❌ Error during review: {str(e)}")
         return 1
+    finally:
+        listener.stop()
     
     return 0
 
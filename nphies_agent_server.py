@@ -3,23 +3,37 @@
 # NEURAL: FastAPI backend with streaming capabilities
 
 from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+import anyio
 import asyncio
-import json
+import hashlib
+import orjson
+import os
+import time
 import uuid
+from collections import OrderedDict, deque
+from contextlib import suppress
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, List, Optional, AsyncGenerator
+from typing import Dict, List, Optional, AsyncGenerator, Union
 from pydantic import BaseModel, Field
 from enum import Enum
 import logging
-from cryptography.fernet import Fernet
+import logging.handlers
+import queue
+import atexit
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+import aiofiles
 import base64
 
 # BRAINSAIT: Healthcare compliance imports
-from fhir.resources.R4.patient import Patient
-from fhir.resources.R4.claim import Claim
-from fhir.resources.R4.practitioner import Practitioner
+# R4B is the R4-compatible model set NPHIES payloads validate against; only
+# the resources actually validated here are imported
+from fhir.resources.R4B.claim import Claim
+
+# fhir.resources 8 models are pydantic v2, validated by pydantic-core
+_validate_claim = Claim.model_validate
 
 # AGENT: AI framework integrations
 from openai import AsyncOpenAI
@@ -27,10 +41,20 @@ from anthropic import AsyncAnthropic
 import httpx
 
 # Initialize FastAPI with NPHIES compliance
+class AgentJSONResponse(ORJSONResponse):
+    """orjson response that also accepts numpy arrays and non-string keys
+    from model outputs (confidence scores, ICD code maps) as-is"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
 app = FastAPI(
     title="BrainSAIT NPHIES-AI Agent Server",
     description="HIPAA & NPHIES compliant AI middleware with AG-UI Protocol",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=AgentJSONResponse
 )
 
 # BRAINSAIT: CORS configuration for mobile app
@@ -42,16 +66,140 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# MEDICAL: Audit logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - [AUDIT] %(message)s'
+# MEDICAL: Audit logging setup. Records are enqueued by a QueueHandler and
+# written by a QueueListener thread, so audit I/O never blocks the event loop.
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [AUDIT] %(message)s')
 )
+_log_queue: queue.Queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(logging.handlers.QueueHandler(_log_queue))
 audit_logger = logging.getLogger("brainsait.audit")
 
-# BRAINSAIT: Encryption for PHI
-encryption_key = Fernet.generate_key()
-cipher_suite = Fernet(encryption_key)
+# BRAINSAIT: Encryption for PHI. Uploads are encrypted with AES-256-GCM in
+# fixed-size chunks, so an image is never held in memory whole; each chunk's
+# nonce is a per-file random prefix plus the chunk counter.
+# ENCRYPTION_KEY is 32 url-safe base64 bytes (the Fernet key format), shared
+# by every worker so any of them can read what another stored. A throwaway
+# per-process key is only acceptable in development.
+_configured_key = os.getenv("ENCRYPTION_KEY")
+if _configured_key:
+    encryption_key = base64.urlsafe_b64decode(_configured_key)
+elif os.getenv("ENVIRONMENT") == "development":
+    audit_logger.warning("ENCRYPTION_KEY not set; using a per-process key, uploads will not survive a restart")
+    encryption_key = AESGCM.generate_key(bit_length=256)
+else:
+    raise RuntimeError("ENCRYPTION_KEY must be set outside ENVIRONMENT=development")
+cipher_suite = AESGCM(encryption_key)
+UPLOAD_CHUNK_SIZE = 1 << 20
+UPLOAD_NONCE_PREFIX_SIZE = 8
+UPLOAD_TAG_SIZE = 16
+# Deployments point this at the persistent /app/secure_storage mount; the
+# relative default is for local development only
+UPLOAD_DIR = os.getenv("MEDICAL_UPLOAD_DIR", "encrypted_uploads")
+
+def upload_chunk_associated_data(file_id: str, counter: int, final: bool) -> bytes:
+    """AES-GCM associated data for one upload chunk: binds the chunk to its
+    file, its position and whether it is the last one, so chunks cannot be
+    swapped between uploads, reordered or dropped from the end"""
+    return file_id.encode() + counter.to_bytes(4, "big") + (b"\x01" if final else b"\x00")
+
+def decrypt_upload(file_id: str, blob: bytes) -> bytes:
+    """Decrypt a stored upload: an 8-byte nonce prefix followed by AES-GCM
+    chunks of UPLOAD_CHUNK_SIZE plaintext bytes. Raises InvalidTag if any
+    chunk was altered, reordered, taken from another file or dropped."""
+    nonce_prefix, body = blob[:UPLOAD_NONCE_PREFIX_SIZE], memoryview(blob)[UPLOAD_NONCE_PREFIX_SIZE:]
+    step = UPLOAD_CHUNK_SIZE + UPLOAD_TAG_SIZE
+    count = max(1, -(-len(body) // step))
+    plaintext = bytearray()
+    for counter in range(count):
+        nonce = nonce_prefix + counter.to_bytes(4, "big")
+        associated_data = upload_chunk_associated_data(file_id, counter, counter == count - 1)
+        plaintext += cipher_suite.decrypt(nonce, body[counter * step:(counter + 1) * step], associated_data)
+    return bytes(plaintext)
+
+# AGENT: Outbound LLM call limits shared by every agent and session, so
+# concurrent chats queue here instead of surfacing provider 429s
+class LLMRateLimiter:
+    """Sliding-window limiter: at most `requests_per_minute` calls per 60 s"""
+    
+    def __init__(self, requests_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.calls: deque = deque()
+    
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            while self.calls and now - self.calls[0] >= 60:
+                self.calls.popleft()
+            if len(self.calls) < self.requests_per_minute:
+                self.calls.append(now)
+                return
+            await asyncio.sleep(60 - (now - self.calls[0]))
+
+# Both limits are per worker process: with N uvicorn workers (the Docker CMD
+# runs 4, `python nphies_agent_server.py` one per CPU) the provider sees up to
+# N x LLM_MAX_CONCURRENCY calls in flight and N x LLM_REQUESTS_PER_MINUTE,
+# so set them to the provider quota divided by the worker count.
+LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+llm_rate_limiter = LLMRateLimiter(int(os.getenv("LLM_REQUESTS_PER_MINUTE", "60")))
+
+# AGENT: One provider client (and so one keep-alive connection pool) per
+# process, shared by every agent and created on first use
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(http_client=httpx.AsyncClient(limits=LLM_HTTP_LIMITS))
+
+@lru_cache(maxsize=None)
+def get_anthropic_client() -> AsyncAnthropic:
+    return AsyncAnthropic(http_client=httpx.AsyncClient(limits=LLM_HTTP_LIMITS))
+
+# AGENT: Bilingual replies are reused for near-duplicate requests. Batches of
+# claims from one provider template differ only in whitespace of the message
+# or key order of the claim, so both are normalized into the key. Case is
+# kept: "MS"/"ms" or "Mg"/"mg" are clinically different.
+class BilingualResponseCache:
+    """Bounded LRU of (arabic, english) replies keyed by normalized request"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple[str, str]]" = OrderedDict()
+    
+    @staticmethod
+    def key(request: "AGUIRequest") -> str:
+        claim = request.nphies_data
+        payload = orjson.dumps(
+            [
+                " ".join(request.message.split()),
+                claim.claim_data if claim else None,
+                claim.language if claim else None,
+            ],
+            default=str,
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[tuple[str, str]]:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: tuple[str, str]):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+bilingual_response_cache = BilingualResponseCache(int(os.getenv("BILINGUAL_CACHE_MAX_ENTRIES", "4096")))
 
 # AG-UI Protocol Event Types
 class AGUIEventType(str, Enum):
@@ -91,26 +239,63 @@ class AGUIEvent(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     session_id: str
 
+# Pre-encoded `"type":...,"data":` envelope fragment for each event type
+_EVENT_TYPE_FRAGMENTS = {
+    event_type: b',"type":' + orjson.dumps(event_type.value) + b',"data":'
+    for event_type in AGUIEventType
+}
+
+def preencoded_event(event_type: AGUIEventType, data: Dict) -> bytes:
+    """Encode the type and data of an event whose payload never changes; the
+    stream adds the session id and timestamp when it is sent"""
+    return _EVENT_TYPE_FRAGMENTS[event_type] + orjson.dumps(data)
+
+NPHIES_TOOL_CALL_START = preencoded_event(AGUIEventType.TOOL_CALL_START, {
+    "tool_name": "nphies_claim_processor",
+    "description": "معالجة طلب المطالبة عبر نظام نفيس / Processing NPHIES claim request"
+})
+NPHIES_TOOL_CALL_END = preencoded_event(AGUIEventType.TOOL_CALL_END, {"tool_name": "nphies_claim_processor"})
+NPHIES_COMPLETE = preencoded_event(AGUIEventType.COMPLETE, {"status": "completed"})
+
 # BRAINSAIT: BrainSAIT Agent Classes
 class BrainSAITAgent:
     """Base class for all BrainSAIT healthcare agents"""
     
     def __init__(self, agent_name: str):
         self.agent_name = agent_name
-        self.openai_client = AsyncOpenAI()
-        self.anthropic_client = AsyncAnthropic()
     
-    async def audit_log(self, action: str, user_id: str, data: Dict):
-        """BRAINSAIT: Comprehensive audit logging for HIPAA compliance"""
+    @property
+    def openai_client(self) -> AsyncOpenAI:
+        return get_openai_client()
+    
+    @property
+    def anthropic_client(self) -> AsyncAnthropic:
+        return get_anthropic_client()
+    
+    async def call_llm(self, create, **kwargs):
+        """AGENT: Make one OpenAI/Anthropic call under the shared limits, e.g.
+        `await self.call_llm(self.anthropic_client.messages.create, model=..., messages=...)`"""
+        async with LLM_SEMAPHORE:
+            await llm_rate_limiter.acquire()
+            return await create(**kwargs)
+    
+    def audit_log(self, action: str, user_id: str, data: Dict):
+        """BRAINSAIT: Comprehensive audit logging for HIPAA compliance; synchronous
+        because the queue-backed handler only enqueues the record"""
         audit_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "agent": self.agent_name,
             "action": action,
             "user_id": user_id,
-            "data_hash": hash(str(data)),
+            # Stable across processes (unlike the salted builtin hash) and
+            # canonical, since keys are sorted before hashing
+            "data_hash": hashlib.blake2b(
+                orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS),
+                digest_size=16,
+            ).hexdigest(),
             "session_id": data.get("session_id")
         }
-        audit_logger.info(f"AUDIT: {json.dumps(audit_entry)}")
+        audit_logger.info("AUDIT: %s", orjson.dumps(audit_entry).decode())
 
 class MASTERLINCAgent(BrainSAITAgent):
     """MASTERLINC: Main orchestration agent for NPHIES workflows"""
@@ -118,37 +303,29 @@ class MASTERLINCAgent(BrainSAITAgent):
     def __init__(self):
         super().__init__("MASTERLINC")
     
-    async def process_nphies_request(self, request: AGUIRequest) -> AsyncGenerator[AGUIEvent, None]:
-        """Main processing pipeline for NPHIES claims and requests"""
+    async def process_nphies_request(self, request: AGUIRequest) -> AsyncGenerator[Union[AGUIEvent, bytes], None]:
+        """Main processing pipeline for NPHIES claims and requests; constant
+        events are yielded as pre-encoded bytes (see preencoded_event)"""
         
-        await self.audit_log("nphies_request_start", request.user_id, {
+        self.audit_log("nphies_request_start", request.user_id, {
             "session_id": request.session_id,
             "user_role": request.user_role
         })
         
         # AGENT: Start processing indication
-        yield AGUIEvent(
-            type=AGUIEventType.TOOL_CALL_START,
-            data={
-                "tool_name": "nphies_claim_processor",
-                "description": "معالجة طلب المطالبة عبر نظام نفيس / Processing NPHIES claim request"
-            },
-            session_id=request.session_id
-        )
+        yield NPHIES_TOOL_CALL_START
         
+        # AGENT: Stages are independent, so validation and response
+        # generation run concurrently with image analysis and each result is
+        # emitted as soon as it completes
+        stages: Dict[asyncio.Task, str] = {}
         try:
             # MEDICAL: FHIR validation
             if request.nphies_data:
-                validation_result = await self.validate_fhir_claim(request.nphies_data.claim_data)
-                
-                yield AGUIEvent(
-                    type=AGUIEventType.STATE_DELTA,
-                    data={
-                        "validation_status": validation_result,
-                        "step": "fhir_validation"
-                    },
-                    session_id=request.session_id
-                )
+                stages[asyncio.create_task(self.validate_fhir_claim(request.nphies_data.claim_data))] = "fhir_validation"
+            
+            # BILINGUAL: Generate bilingual response
+            stages[asyncio.create_task(self.generate_bilingual_response(request))] = "bilingual_response"
             
             # AGENT: Call specialized agents based on request type
             if request.multimodal_data:
@@ -156,23 +333,35 @@ class MASTERLINCAgent(BrainSAITAgent):
                 async for event in self.process_medical_images(request):
                     yield event
             
-            # BILINGUAL: Generate bilingual response
-            response_ar, response_en = await self.generate_bilingual_response(request)
-            
-            yield AGUIEvent(
-                type=AGUIEventType.TEXT_MESSAGE_CONTENT,
-                data={
-                    "content": response_ar if request.nphies_data and request.nphies_data.language == "ar" else response_en,
-                    "bilingual": {
-                        "ar": response_ar,
-                        "en": response_en
-                    }
-                },
-                session_id=request.session_id
-            )
+            while stages:
+                done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = stages.pop(task)
+                    if stage == "fhir_validation":
+                        yield AGUIEvent(
+                            type=AGUIEventType.STATE_DELTA,
+                            data={
+                                "validation_status": task.result(),
+                                "step": "fhir_validation"
+                            },
+                            session_id=request.session_id
+                        )
+                    else:
+                        response_ar, response_en = task.result()
+                        yield AGUIEvent(
+                            type=AGUIEventType.TEXT_MESSAGE_CONTENT,
+                            data={
+                                "content": response_ar if request.nphies_data and request.nphies_data.language == "ar" else response_en,
+                                "bilingual": {
+                                    "ar": response_ar,
+                                    "en": response_en
+                                }
+                            },
+                            session_id=request.session_id
+                        )
             
         except Exception as e:
-            await self.audit_log("error", request.user_id, {"error": str(e)})
+            self.audit_log("error", request.user_id, {"error": str(e)})
             yield AGUIEvent(
                 type=AGUIEventType.ERROR,
                 data={"error": f"خطأ في معالجة الطلب / Processing error: {str(e)}"},
@@ -180,23 +369,21 @@ class MASTERLINCAgent(BrainSAITAgent):
             )
         
         finally:
-            yield AGUIEvent(
-                type=AGUIEventType.TOOL_CALL_END,
-                data={"tool_name": "nphies_claim_processor"},
-                session_id=request.session_id
-            )
-            
-            yield AGUIEvent(
-                type=AGUIEventType.COMPLETE,
-                data={"status": "completed"},
-                session_id=request.session_id
-            )
+            # No yields here: a disconnect closes the generator and must not
+            # be answered with more events
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+        
+        yield NPHIES_TOOL_CALL_END
+        
+        yield NPHIES_COMPLETE
     
     async def validate_fhir_claim(self, claim_data: Dict) -> Dict:
         """MEDICAL: Validate FHIR R4 Claim resource against NPHIES requirements"""
         try:
             # Parse and validate FHIR Claim
-            claim = Claim.parse_obj(claim_data)
+            claim = _validate_claim(claim_data)
             
             # NPHIES-specific validations
             validations = {
@@ -256,6 +443,11 @@ class MASTERLINCAgent(BrainSAITAgent):
     async def generate_bilingual_response(self, request: AGUIRequest) -> tuple[str, str]:
         """BILINGUAL: Generate responses in both Arabic and English"""
         
+        cache_key = bilingual_response_cache.key(request)
+        cached = bilingual_response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         system_prompt = """
         You are a NPHIES-compliant medical AI assistant for Saudi healthcare.
         Always respond in both Arabic and English.
@@ -266,6 +458,7 @@ class MASTERLINCAgent(BrainSAITAgent):
         response_ar = f"تم معالجة طلبك بنجاح عبر نظام نفيس"
         response_en = f"Your NPHIES request has been processed successfully"
         
+        bilingual_response_cache.put(cache_key, (response_ar, response_en))
         return response_ar, response_en
 
 class HEALTHCARELINCAgent(BrainSAITAgent):
@@ -293,16 +486,16 @@ clinicallinc = CLINICALLINCAgent()
 compliancelinc = COMPLIANCELINCAgent()
 
 # BRAINSAIT: Role-based access control
-async def verify_user_permissions(user_role: UserRole, action: str) -> bool:
+ROLE_PERMISSIONS: Dict[UserRole, frozenset] = {
+    UserRole.PROVIDER: frozenset({"create_claim", "upload_images", "view_status"}),
+    UserRole.PAYER: frozenset({"review_claim", "approve_claim", "audit_trail"}),
+    UserRole.PATIENT: frozenset({"view_claim", "upload_consent"}),
+    UserRole.AUDITOR: frozenset({"view_all", "audit_trail", "compliance_report"})
+}
+
+def verify_user_permissions(user_role: UserRole, action: str) -> bool:
     """Verify user has permission for requested action"""
-    permissions = {
-        UserRole.PROVIDER: ["create_claim", "upload_images", "view_status"],
-        UserRole.PAYER: ["review_claim", "approve_claim", "audit_trail"],
-        UserRole.PATIENT: ["view_claim", "upload_consent"],
-        UserRole.AUDITOR: ["view_all", "audit_trail", "compliance_report"]
-    }
-    
-    return action in permissions.get(user_role, [])
+    return action in ROLE_PERMISSIONS.get(user_role, frozenset())
 
 # AG-UI Protocol Implementation
 @app.post("/ag-ui/chat")
@@ -313,35 +506,62 @@ async def handle_ag_ui_request(request: AGUIRequest):
     """
     
     # BRAINSAIT: Permission verification
-    if not await verify_user_permissions(request.user_role, "chat"):
+    if not verify_user_permissions(request.user_role, "chat"):
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
+    async def produce_events(send_stream):
+        # Route to appropriate agent based on request content
+        async with send_stream:
+            async for event in masterlinc.process_nphies_request(request):
+                await send_stream.send(event)
+    
     async def event_stream():
         """Stream AG-UI events according to protocol specification"""
+        # Every event in the session shares the same session_id, so that part
+        # of the envelope is encoded once and only the varying fields follow
+        session_prefix = b"data: " + orjson.dumps({"session_id": request.session_id})[:-1]
+        
+        def encode_event(event: Union[AGUIEvent, bytes]) -> bytes:
+            if isinstance(event, bytes):
+                return session_prefix + event + b',"timestamp":' + orjson.dumps(datetime.utcnow()) + b"}\n\n"
+            # Format as AG-UI Protocol event; orjson emits UTF-8 (Arabic
+            # stays unescaped) and serializes the datetime itself
+            return (
+                session_prefix
+                + _EVENT_TYPE_FRAGMENTS[event.type]
+                + orjson.dumps(event.data, default=str)
+                + b',"timestamp":'
+                + orjson.dumps(event.timestamp)
+                + b"}\n\n"
+            )
+        
+        # The agents produce into a buffered stream; every event already
+        # waiting when the consumer wakes goes out in a single chunk
+        send_stream, receive_stream = anyio.create_memory_object_stream(max_buffer_size=64)
+        producer = asyncio.create_task(produce_events(send_stream))
         try:
-            # Route to appropriate agent based on request content
-            async for event in masterlinc.process_nphies_request(request):
-                # Format as AG-UI Protocol event
-                event_data = {
-                    "type": event.type,
-                    "data": event.data,
-                    "timestamp": event.timestamp.isoformat(),
-                    "session_id": event.session_id
-                }
-                
-                yield f"data: {json.dumps(event_data, ensure_ascii=False)}\n\n"
-                
-                # Small delay for streaming effect
-                await asyncio.sleep(0.1)
+            async with receive_stream:
+                async for event in receive_stream:
+                    chunk = [encode_event(event)]
+                    while True:
+                        try:
+                            chunk.append(encode_event(receive_stream.receive_nowait()))
+                        except (anyio.WouldBlock, anyio.EndOfStream):
+                            break
+                    yield b"".join(chunk)
+            await producer
                 
         except Exception as e:
-            error_event = {
-                "type": "error",
-                "data": {"error": str(e)},
-                "timestamp": datetime.utcnow().isoformat(),
-                "session_id": request.session_id
-            }
-            yield f"data: {json.dumps(error_event)}\n\n"
+            yield encode_event(AGUIEvent(
+                type=AGUIEventType.ERROR,
+                data={"error": str(e)},
+                session_id=request.session_id
+            ))
+        finally:
+            # Reap the producer so a client disconnect doesn't leave it
+            # running or its exception unretrieved
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
     
     return StreamingResponse(
         event_stream(),
@@ -367,15 +587,38 @@ async def upload_medical_image(
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files allowed")
     
-    # BRAINSAIT: Encrypt and store image
-    file_content = await file.read()
-    encrypted_content = cipher_suite.encrypt(file_content)
-    
     # Generate secure file reference
     file_id = str(uuid.uuid4())
     
+    # BRAINSAIT: Encrypt and store image chunk by chunk. One chunk of
+    # lookahead tells us which chunk is last, so the final flag can be bound
+    # into its associated data and truncated files fail to decrypt.
+    nonce_prefix = os.urandom(UPLOAD_NONCE_PREFIX_SIZE)
+    path = os.path.join(UPLOAD_DIR, f"{file_id}.enc")
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    try:
+        async with aiofiles.open(path, "wb") as sink:
+            await sink.write(nonce_prefix)
+            counter = 0
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            while True:
+                next_chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                final = not next_chunk
+                nonce = nonce_prefix + counter.to_bytes(4, "big")
+                associated_data = upload_chunk_associated_data(file_id, counter, final)
+                await sink.write(cipher_suite.encrypt(nonce, chunk, associated_data))
+                if final:
+                    break
+                chunk = next_chunk
+                counter += 1
+    except BaseException:
+        # Never leave a partial PHI file behind (read error, disconnect)
+        with suppress(FileNotFoundError):
+            os.remove(path)
+        raise
+    
     # MEDICAL: Audit log for PHI handling
-    audit_logger.info(f"MEDICAL_IMAGE_UPLOAD: user_id={user_id}, file_id={file_id}, session_id={session_id}")
+    audit_logger.info("MEDICAL_IMAGE_UPLOAD: user_id=%s, file_id=%s, session_id=%s", user_id, file_id, session_id)
     
     return {
         "file_id": file_id,
@@ -383,33 +626,47 @@ async def upload_medical_image(
         "ready_for_analysis": True
     }
 
-@app.get("/health")
+# Liveness payloads are static apart from the timestamp, so they are encoded
+# once at import
+_HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "agents": ["MASTERLINC", "HEALTHCARELINC", "CLINICALLINC", "COMPLIANCELINC"],
+    "compliance": ["HIPAA", "NPHIES"],
+    "protocols": ["AG-UI", "FHIR-R4"]
+})[:-1] + b',"timestamp":"'
+
+_AGENTS_STATUS = orjson.dumps({
+    "MASTERLINC": {"status": "active", "version": "1.0.0"},
+    "HEALTHCARELINC": {"status": "active", "version": "1.0.0"},
+    "CLINICALLINC": {"status": "active", "version": "1.0.0"},
+    "COMPLIANCELINC": {"status": "active", "version": "1.0.0"}
+})
+
+@app.get("/health", response_class=AgentJSONResponse)
 async def health_check():
     """System health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "agents": ["MASTERLINC", "HEALTHCARELINC", "CLINICALLINC", "COMPLIANCELINC"],
-        "compliance": ["HIPAA", "NPHIES"],
-        "protocols": ["AG-UI", "FHIR-R4"]
-    }
+    body = _HEALTH_PREFIX + datetime.utcnow().isoformat().encode() + b'"}'
+    return Response(content=body, media_type="application/json")
 
-@app.get("/agents/status")
+@app.get("/agents/status", response_class=AgentJSONResponse)
 async def agents_status():
     """AGENT: Get status of all BrainSAIT agents"""
-    return {
-        "MASTERLINC": {"status": "active", "version": "1.0.0"},
-        "HEALTHCARELINC": {"status": "active", "version": "1.0.0"},
-        "CLINICALLINC": {"status": "active", "version": "1.0.0"},
-        "COMPLIANCELINC": {"status": "active", "version": "1.0.0"}
-    }
+    return Response(content=_AGENTS_STATUS, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    # reload forks a file watcher and forces a single worker, so it is only
+    # used in development; the audit logger already records every request
+    if os.getenv("ENVIRONMENT") == "development":
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=os.cpu_count() or 1,
+            loop="uvloop",
+            http="httptools",
+            log_level="warning",
+            access_log=False
+        )
@@ -0,0 +1,27 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# nphies_agent_server refuses to start without a shared upload key outside
+# development; tests run with a throwaway one
+os.environ.setdefault("ENVIRONMENT", "development")
+
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    """main.py imported from a scratch directory, since it creates logs/ and
+    mounts static/ relative to the working directory"""
+    workdir = tmp_path_factory.mktemp("main")
+    (workdir / "static").symlink_to(ROOT / "static")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        return importlib.import_module("main")
+    finally:
+        os.chdir(cwd)
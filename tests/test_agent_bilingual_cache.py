@@ -0,0 +1,48 @@
+"""Cache keys for nphies_agent_server's bilingual replies"""
+import asyncio
+
+import pytest
+
+agent_server = pytest.importorskip("nphies_agent_server")
+
+
+def make_request(message: str, claim_data: dict) -> "agent_server.AGUIRequest":
+    return agent_server.AGUIRequest(
+        message=message,
+        user_id="u1",
+        user_role="provider",
+        session_id="s1",
+        nphies_data={
+            "patient_id": "p1",
+            "provider_id": "v1",
+            "claim_data": claim_data,
+            "language": "ar",
+        },
+    )
+
+
+def test_key_collapses_whitespace_and_claim_key_order():
+    key = agent_server.BilingualResponseCache.key
+    assert key(make_request("dose  500 mg\n", {"a": 1, "b": 2})) == key(
+        make_request("dose 500 mg", {"b": 2, "a": 1})
+    )
+
+
+@pytest.mark.parametrize("first, second", [("MS flare", "ms flare"), ("5 Mg", "5 mg")])
+def test_messages_differing_only_in_case_do_not_share_an_entry(first, second, monkeypatch):
+    cache = agent_server.BilingualResponseCache(max_entries=8)
+    monkeypatch.setattr(agent_server, "bilingual_response_cache", cache)
+    agent = agent_server.masterlinc
+    asyncio.run(agent.generate_bilingual_response(make_request(first, {})))
+    asyncio.run(agent.generate_bilingual_response(make_request(second, {})))
+    assert len(cache.entries) == 2
+
+
+def test_lru_evicts_oldest_entry():
+    cache = agent_server.BilingualResponseCache(max_entries=2)
+    cache.put("a", ("ar-a", "en-a"))
+    cache.put("b", ("ar-b", "en-b"))
+    assert cache.get("a") == ("ar-a", "en-a")
+    cache.put("c", ("ar-c", "en-c"))
+    assert cache.get("b") is None
+    assert list(cache.entries) == ["a", "c"]
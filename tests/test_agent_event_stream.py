@@ -0,0 +1,53 @@
+"""Shutdown behaviour of nphies_agent_server's event pipeline"""
+import asyncio
+
+import pytest
+
+agent_server = pytest.importorskip("nphies_agent_server")
+
+
+def make_request() -> "agent_server.AGUIRequest":
+    return agent_server.AGUIRequest(message="claim status", user_id="u1", user_role="provider", session_id="s1")
+
+
+def test_pipeline_ends_with_tool_call_end_and_complete():
+    async def collect():
+        return [event async for event in agent_server.masterlinc.process_nphies_request(make_request())]
+
+    events = asyncio.run(collect())
+    assert events[0] is agent_server.NPHIES_TOOL_CALL_START
+    assert events[-2:] == [agent_server.NPHIES_TOOL_CALL_END, agent_server.NPHIES_COMPLETE]
+
+
+def test_closing_pipeline_mid_stream_yields_nothing_more():
+    async def close_after_first_stage():
+        events = agent_server.masterlinc.process_nphies_request(make_request())
+        await events.__anext__()  # tool call start
+        await events.__anext__()  # bilingual response, inside the stage loop
+        await events.aclose()  # raises if the generator yields while closing
+
+    asyncio.run(close_after_first_stage())
+
+
+def test_disconnect_cancels_and_awaits_producer(monkeypatch):
+    closed = []
+
+    async def endless(request):
+        try:
+            while True:
+                yield agent_server.NPHIES_TOOL_CALL_START
+                await asyncio.sleep(0)
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(agent_server, "verify_user_permissions", lambda role, action: True)
+    monkeypatch.setattr(agent_server.masterlinc, "process_nphies_request", endless)
+
+    async def disconnect_after_first_chunk():
+        response = await agent_server.handle_ag_ui_request(make_request())
+        body = response.body_iterator
+        await body.__anext__()
+        await body.aclose()
+        return closed == [True]
+
+    assert asyncio.run(disconnect_after_first_chunk())
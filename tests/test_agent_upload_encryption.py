@@ -0,0 +1,76 @@
+"""Chunked AES-GCM storage of medical image uploads in nphies_agent_server"""
+import asyncio
+import os
+
+import pytest
+
+agent_server = pytest.importorskip("nphies_agent_server")
+from cryptography.exceptions import InvalidTag
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers, UploadFile
+
+CHUNK = 64
+STEP = CHUNK + agent_server.UPLOAD_TAG_SIZE
+PREFIX = agent_server.UPLOAD_NONCE_PREFIX_SIZE
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_server, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(agent_server, "UPLOAD_CHUNK_SIZE", CHUNK)
+    return tmp_path
+
+
+def upload(data: bytes, upload_dir) -> tuple[str, bytes]:
+    response = TestClient(agent_server.app).post(
+        "/upload/medical-image", files={"file": ("scan.png", data, "image/png")}
+    )
+    assert response.status_code == 200
+    file_id = response.json()["file_id"]
+    return file_id, (upload_dir / f"{file_id}.enc").read_bytes()
+
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK, CHUNK * 2 + CHUNK // 2])
+def test_round_trip(upload_dir, size):
+    data = os.urandom(size)
+    file_id, blob = upload(data, upload_dir)
+    assert agent_server.decrypt_upload(file_id, blob) == data
+
+
+def test_dropping_trailing_chunks_is_rejected(upload_dir):
+    file_id, blob = upload(os.urandom(CHUNK * 3), upload_dir)
+    with pytest.raises(InvalidTag):
+        agent_server.decrypt_upload(file_id, blob[:PREFIX + 2 * STEP])
+    with pytest.raises(InvalidTag):
+        agent_server.decrypt_upload(file_id, blob[:PREFIX])
+
+
+def test_reordered_chunks_are_rejected(upload_dir):
+    file_id, blob = upload(os.urandom(CHUNK * 3), upload_dir)
+    first, second = blob[PREFIX:PREFIX + STEP], blob[PREFIX + STEP:PREFIX + 2 * STEP]
+    swapped = blob[:PREFIX] + second + first + blob[PREFIX + 2 * STEP:]
+    with pytest.raises(InvalidTag):
+        agent_server.decrypt_upload(file_id, swapped)
+
+
+def test_chunks_are_bound_to_their_file(upload_dir):
+    file_id, blob = upload(os.urandom(CHUNK), upload_dir)
+    other_id, _ = upload(os.urandom(CHUNK), upload_dir)
+    with pytest.raises(InvalidTag):
+        agent_server.decrypt_upload(other_id, blob)
+
+
+def test_failed_upload_leaves_no_partial_file(upload_dir):
+    class FailingUpload(UploadFile):
+        reads = 0
+
+        async def read(self, size: int = -1) -> bytes:
+            self.reads += 1
+            if self.reads > 2:
+                raise OSError("connection lost")
+            return b"x" * size
+
+    file = FailingUpload(file=None, filename="scan.png", headers=Headers({"content-type": "image/png"}))
+    with pytest.raises(OSError):
+        asyncio.run(agent_server.upload_medical_image(file=file, user_id="u1", session_id="s1"))
+    assert list(upload_dir.iterdir()) == []
@@ -0,0 +1,93 @@
+"""bedrock_converse must build a request the pinned botocore accepts"""
+import asyncio
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+class _RawBody:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+CONVERSE_REPLY = {
+    "output": {"message": {"role": "assistant", "content": [{"text": "ok"}]}},
+    "stopReason": "end_turn",
+    "usage": {
+        "inputTokens": 12,
+        "outputTokens": 3,
+        "totalTokens": 15,
+        "cacheReadInputTokens": 1024,
+        "cacheWriteInputTokens": 0,
+    },
+    "metrics": {"latencyMs": 1},
+}
+
+
+@pytest.fixture
+def main(monkeypatch, tmp_path):
+    # main.py creates logs/ and mounts static/ relative to the working directory
+    (tmp_path / "static").symlink_to(ROOT / "static")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("BEDROCK_MODEL_ID", "anthropic.claude-3-7-sonnet-20250219-v1:0")
+    import main as module
+    return importlib.reload(module)
+
+
+def test_converse_request_uses_system_cache_point(main, monkeypatch):
+    sent = []
+
+    def reply(request, **kwargs):
+        sent.append(request)
+        return AWSResponse(request.url, 200, {}, _RawBody(json.dumps(CONVERSE_REPLY).encode()))
+
+    # Real client and serializer; only the HTTP send is replaced
+    client = boto3.client("bedrock-runtime", region_name="us-east-1")
+    client.meta.events.register("before-send.bedrock-runtime.Converse", reply)
+    monkeypatch.setattr(main, "get_client", lambda service_name: client)
+
+    result = main.bedrock_converse("chest pain", "clinical", "en")
+
+    body = json.loads(sent[0].body)
+    assert body["system"] == [
+        {"text": main.BEDROCK_SYSTEM_PROMPT},
+        {"cachePoint": {"type": "default"}},
+    ]
+    assert body["messages"][0]["content"][1] == {"text": "chest pain"}
+    assert result["analysis"] == "ok"
+    assert result["usage"]["cache_read_input_tokens"] == 1024
+
+
+def test_cache_hit_reports_zero_usage(main, monkeypatch):
+    calls = []
+
+    def converse(text, context, language):
+        calls.append(text)
+        return {"analysis": "ok", "usage": {"input_tokens": 12, "output_tokens": 3,
+                                            "cache_read_input_tokens": 1024, "cache_write_input_tokens": 0}}
+
+    monkeypatch.setattr(main, "get_client", lambda service_name: object())
+    monkeypatch.setattr(main, "bedrock_converse", converse)
+    request = main.AIAnalysisRequest(text="chest pain", context="clinical")
+
+    first = asyncio.run(main.bedrock_analyze(request, current_user={}))
+    second = asyncio.run(main.bedrock_analyze(request, current_user={}))
+
+    assert len(calls) == 1
+    assert second["cache"] == "hit"
+    assert second["usage"] == dict.fromkeys(first["usage"], 0)
+    # first is the stored entry; zeroing the hit must not touch it
+    assert first["usage"]["input_tokens"] == 12
@@ -0,0 +1,31 @@
+"""Keyword matching behind get_healthcare_response in main.py"""
+import itertools
+
+SHARED_PATTERNS = {
+    "claims": {"keywords": ["help", "claim"], "responses": ["claims reply"]},
+    "general": {"keywords": ["help"], "responses": ["general reply"]},
+}
+
+
+def test_shared_keyword_maps_to_every_category(main):
+    automaton = main.build_keyword_automaton(SHARED_PATTERNS)
+    assert automaton.get("help") == ("help", ("claims", "general"))
+    assert automaton.get("claim") == ("claim", ("claims",))
+
+
+def test_shared_keyword_counts_once_per_category(main, monkeypatch):
+    monkeypatch.setattr(main, "KEYWORD_AUTOMATON", main.build_keyword_automaton(SHARED_PATTERNS))
+    monkeypatch.setattr(main, "PATTERN_KEYWORD_COUNTS", {"claims": 2, "general": 1})
+    monkeypatch.setattr(main, "RESPONSE_CYCLERS", {
+        category: itertools.cycle(data["responses"]) for category, data in SHARED_PATTERNS.items()
+    })
+    # "help" scores 1/2 for claims and 1/1 for general
+    reply = main.get_healthcare_response("I need help")
+    assert reply.startswith("general reply")
+    assert "AI Confidence: 100%" in reply
+    # "help claim" scores 2/2 for claims, which wins ties by pattern order
+    assert main.get_healthcare_response("help with my claim").startswith("claims reply")
+
+
+def test_builtin_patterns_route_to_their_category(main):
+    assert "Context: Healthcare-Claims" in main.get_healthcare_response("what is my claim status")
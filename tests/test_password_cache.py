@@ -0,0 +1,70 @@
+"""verify_password's bcrypt outcome cache in main.py"""
+import time
+
+import pytest
+
+HASH = "$2b$12$stored-service-account-hash"
+
+
+class CountingContext:
+    """Stands in for the passlib context: the cache, not bcrypt, is under test"""
+
+    def __init__(self, password: str):
+        self.password = password
+        self.calls = 0
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        self.calls += 1
+        return plain_password == self.password
+
+
+@pytest.fixture
+def context(main, monkeypatch):
+    main._password_cache.clear()
+    context = CountingContext("correct horse")
+    monkeypatch.setattr(main, "pwd_context", context)
+    yield context
+    main._password_cache.clear()
+
+
+def test_wrong_password_never_gets_a_cached_success(main, context):
+    assert main.verify_password("correct horse", HASH) is True
+    assert main.verify_password("wrong", HASH) is False
+    assert main.verify_password("wrong", HASH) is False
+    assert main.verify_password("correct horse ", HASH) is False
+    assert context.calls == 3
+
+
+def test_repeated_outcomes_skip_the_kdf(main, context):
+    for _ in range(3):
+        assert main.verify_password("correct horse", HASH) is True
+        assert main.verify_password("wrong", HASH) is False
+    assert context.calls == 2
+
+
+def test_entries_expire_after_the_ttl(main, context, monkeypatch):
+    main.verify_password("correct horse", HASH)
+    now = time.monotonic()
+    monkeypatch.setattr(main.time, "monotonic", lambda: now + main.PASSWORD_CACHE_TTL_SECONDS + 1)
+    main.verify_password("correct horse", HASH)
+    assert context.calls == 2
+
+
+def test_a_rotated_hash_is_verified_again(main, context):
+    main.verify_password("correct horse", HASH)
+    context.password = "new password"
+    assert main.verify_password("correct horse", HASH + "rotated") is False
+    assert context.calls == 2
+
+
+def test_cache_is_bounded(main, context):
+    for index in range(main.PASSWORD_CACHE_MAX_ENTRIES + 1):
+        main.verify_password(f"guess-{index}", HASH)
+    assert len(main._password_cache) <= main.PASSWORD_CACHE_MAX_ENTRIES
+
+
+def test_plain_password_path_is_not_cached(main, context, monkeypatch):
+    monkeypatch.setattr(main, "SERVICE_ACCOUNT_PASSWORD", "dev-password")
+    assert main.verify_password("dev-password", None) is True
+    assert main.verify_password("other", None) is False
+    assert main._password_cache == {}
@@ -0,0 +1,75 @@
+"""SimpleRateLimiter token buckets in main.py"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(main, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(main.time, "monotonic", clock)
+    return clock
+
+
+def hit(limiter, key: str = "svc"):
+    asyncio.run(limiter.hit(key))
+
+
+def test_empty_bucket_returns_429(main, clock):
+    limiter = main.SimpleRateLimiter(limit=3, window_seconds=60)
+    for _ in range(3):
+        hit(limiter)
+    with pytest.raises(HTTPException) as exc:
+        hit(limiter)
+    assert exc.value.status_code == 429
+    # Other keys have their own bucket
+    hit(limiter, "other")
+
+
+def test_bucket_refills_over_time(main, clock):
+    limiter = main.SimpleRateLimiter(limit=3, window_seconds=60)
+    for _ in range(3):
+        hit(limiter)
+    # One token per 20 s at 3 per minute
+    clock.now += 19
+    with pytest.raises(HTTPException):
+        hit(limiter)
+    clock.now += 1
+    hit(limiter)
+    with pytest.raises(HTTPException):
+        hit(limiter)
+    # Refill is capped at the limit however long the key is idle
+    clock.now += 3600
+    for _ in range(3):
+        hit(limiter)
+    with pytest.raises(HTTPException):
+        hit(limiter)
+
+
+def test_prune_removes_idle_buckets(main, clock):
+    limiter = main.SimpleRateLimiter(limit=3, window_seconds=60)
+    hit(limiter, "idle")
+    clock.now += 30
+    hit(limiter, "active")
+    clock.now += 31
+    limiter.prune()
+    assert list(limiter.buckets) == ["active"]
+
+
+def test_secure_endpoint_answers_429_once_the_bucket_is_empty(main, monkeypatch):
+    monkeypatch.setattr(main, "rate_limiter", main.SimpleRateLimiter(limit=2, window_seconds=60))
+    token = main.create_access_token({"sub": "rate-limit-test"})
+    client = TestClient(main.app)
+    headers = {"Authorization": f"Bearer {token}"}
+    statuses = [client.get("/system/status", headers=headers).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
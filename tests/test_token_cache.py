@@ -0,0 +1,68 @@
+"""decode_token's verified-claims cache in main.py"""
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(main):
+    main._token_cache.clear()
+    yield
+    main._token_cache.clear()
+
+
+def cached_expiry(main) -> float:
+    (_, expires_at), = main._token_cache.values()
+    return expires_at
+
+
+def test_long_lived_token_is_cached_for_the_cache_ttl(main):
+    token = main.create_access_token({"sub": "svc"}, timedelta(hours=1))
+    before = time.time()
+    assert main.decode_token(token) == {"sub": "svc", "scopes": []}
+    assert before + main.TOKEN_CACHE_TTL_SECONDS <= cached_expiry(main) <= time.time() + main.TOKEN_CACHE_TTL_SECONDS
+
+
+def test_short_lived_token_is_cached_until_its_exp(main):
+    token = main.create_access_token({"sub": "svc"}, timedelta(seconds=60))
+    main.decode_token(token)
+    exp = jwt.get_unverified_claims(token)["exp"]
+    assert cached_expiry(main) == exp
+
+
+def test_expired_cache_entry_is_verified_again(main, monkeypatch):
+    token = main.create_access_token({"sub": "svc"}, timedelta(hours=1))
+    main.decode_token(token)
+
+    calls = []
+    real_decode = main.jwt.decode
+    monkeypatch.setattr(main.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw))
+    main.decode_token(token)
+    assert calls == []
+
+    now = time.time()
+    monkeypatch.setattr(main.time, "time", lambda: now + main.TOKEN_CACHE_TTL_SECONDS + 1)
+    main.decode_token(token)
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-jwt",
+    jwt.encode({"sub": "svc"}, "some-other-secret", algorithm="HS256"),
+])
+def test_invalid_tokens_are_never_cached(main, token):
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            main.decode_token(token)
+        assert exc.value.status_code == 401
+    assert main._token_cache == {}
+
+
+def test_token_without_subject_is_not_cached(main):
+    token = main.create_access_token({"scopes": ["read"]})
+    with pytest.raises(HTTPException):
+        main.decode_token(token)
+    assert main._token_cache == {}